@@ -0,0 +1,123 @@
+import functools
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+# Bundle layout: magic, index length, JSON index of name -> [offset, size], then the raw files
+# back to back, with offsets counted from the end of the index
+BUNDLE_NAME = "assets.bundle"
+BUNDLE_MAGIC = b"CUBEPAK1"
+HEADER = struct.Struct("<8sI")
+# Only what the game actually loads, everything in here is unpacked on every launch
+BUNDLED_ASSETS = [
+    "art/icons/windows.ico",
+    "assets/music/Song.mp3",
+]
+
+
+def base_path():
+    # PyInstaller one-file builds unpack datas into a temporary folder
+    if getattr(sys, "frozen", False):
+        return sys._MEIPASS
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def pack_bundle(root, output):
+    blobs = []
+    for name in BUNDLED_ASSETS:
+        with open(os.path.join(root, name), "rb") as f:
+            blobs.append((name, f.read()))
+
+    # Offsets are relative to the start of the data, right after the index
+    index = {}
+    offset = 0
+    for name, data in blobs:
+        index[name] = [offset, len(data)]
+        offset += len(data)
+    index_bytes = json.dumps(index, sort_keys=True).encode("utf-8")
+
+    with open(output, "wb") as f:
+        f.write(HEADER.pack(BUNDLE_MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for _, data in blobs:
+            f.write(data)
+    return index
+
+
+class AssetView(io.RawIOBase):
+    """Read-only file object over a slice of the bundle, without copying it up front."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        chunk = self.buffer[self.position:self.position + len(b)]
+        b[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.buffer)
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+class AssetBundle:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_size = HEADER.unpack_from(self.data)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+        self.index = json.loads(self.data[HEADER.size:HEADER.size + index_size].decode("utf-8"))
+        self.data_start = HEADER.size + index_size
+        self.view = memoryview(self.data)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def open(self, name):
+        offset, size = self.index[name]
+        offset += self.data_start
+        return AssetView(self.view[offset:offset + size])
+
+
+@functools.lru_cache(maxsize=None)
+def load_bundle():
+    # Mapped on first use rather than at import, so packing never writes over a mapped bundle
+    path = os.path.join(base_path(), BUNDLE_NAME)
+    if os.path.exists(path):
+        return AssetBundle(path)
+    return None
+
+
+def open_asset(name):
+    """Open an asset by its repo-relative path, from the bundle if one was built."""
+    bundle = load_bundle()
+    if bundle is not None and name in bundle:
+        return bundle.open(name)
+    return open(os.path.join(base_path(), name), "rb")
+
+
+if __name__ == "__main__":
+    root = os.path.dirname(os.path.abspath(__file__))
+    packed = pack_bundle(root, os.path.join(root, BUNDLE_NAME))
+    for asset_name, (_, asset_size) in sorted(packed.items()):
+        print(f"{asset_name}: {asset_size} bytes")
+    print(f"Packed {len(packed)} assets into {BUNDLE_NAME}")
@@ -3,14 +3,26 @@ import random
 import math
 import json
 import os
+from asset_bundle import open_asset
 
 # Initialize pygame
 pygame.init()
 pygame.mixer.init()
 
+# Optional user settings, e.g. a settings.json of {"render_scale": 0.5, "smooth_scaling": false}
+SETTINGS = {}
+if os.path.exists("settings.json"):
+    with open("settings.json", "r") as f:
+        SETTINGS = json.load(f)
+
 # Constants
-WIDTH, HEIGHT = 1000, 700
+WIDTH, HEIGHT = 1000, 700  # Logical canvas size, gameplay coordinates live here
 FPS = 60
+# Internal render target size relative to the logical canvas, lower is faster but blurrier
+RENDER_SCALE = min(1.0, max(0.25, float(SETTINGS.get("render_scale", 1.0))))
+RENDER_WIDTH, RENDER_HEIGHT = int(WIDTH * RENDER_SCALE), int(HEIGHT * RENDER_SCALE)
+# smoothscale when the window isn't render-sized, scale is cheaper but blockier
+SMOOTH_SCALING = bool(SETTINGS.get("smooth_scaling", True))
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
@@ -27,30 +39,195 @@ PLAYER_SIZE = 50
 ENEMY_SIZE = 50
 PROJECTILE_SIZE = 10
 POWERUP_SIZE = 30
+ENEMY_COLORS = {
+    "normal": BLUE,
+    "fast": ORANGE,
+    "tank": (100, 100, 200),
+    "classic": BLUE,
+}
+HEALTH_BAR_HEIGHT = 5
+
+# Timings, in frames at 60 FPS
+PARTICLE_LIFETIME = 30
+POWERUP_LIFETIME = 600  # 10 seconds
+POWERUP_INTERVAL = 600  # 10 seconds
+BUFF_DURATION = 300  # 5 seconds
+DASH_COOLDOWN = 20
+
+# Classic mode (the original V1 game)
+CLASSIC_SPAWN_INTERVAL = 300  # 5 seconds at 60 FPS
+
+# Pre-rendered sprites, filled by load_sprites() once the display mode is set
+SPRITES = {}
+HEALTH_BAR_SPRITES = {}  # filled width in pixels -> bar sprite
+
+
+def scaled(value):
+    # Logical canvas units to render target pixels
+    return int(value * RENDER_SCALE)
+
+
+def scaled_rect(x, y, width, height):
+    return pygame.Rect(scaled(x), scaled(y), scaled(width), scaled(height))
+
+
+def make_square_sprite(color, size, border_color=None):
+    size = scaled(size)
+    sprite = pygame.Surface((size, size)).convert()
+    sprite.fill(color)
+    if border_color is not None:
+        pygame.draw.rect(sprite, border_color, (0, 0, size, size), max(1, scaled(2)))
+    return sprite
+
+
+def load_sprites():
+    for enemy_type, color in ENEMY_COLORS.items():
+        SPRITES[enemy_type] = make_square_sprite(color, ENEMY_SIZE)
+
+    radius = scaled(PROJECTILE_SIZE)
+    projectile = pygame.Surface((radius * 2, radius * 2)).convert()
+    projectile.fill(BLACK)
+    pygame.draw.circle(projectile, YELLOW, (radius, radius), radius)
+    projectile.set_colorkey(BLACK, pygame.RLEACCEL)
+    SPRITES["projectile"] = projectile
+
+    trail = pygame.Surface((scaled(PLAYER_SIZE + 10), scaled(PLAYER_SIZE + 10)), pygame.SRCALPHA)
+    trail.fill((*CYAN, 100))
+    SPRITES["speed_trail"] = trail.convert_alpha()
+
+
+def player_sprite(color):
+    key = ("player", color)
+    if key not in SPRITES:
+        SPRITES[key] = make_square_sprite(color, PLAYER_SIZE, WHITE)
+    return SPRITES[key]
+
+
+def touching(x1, y1, x2, y2, distance):
+    dx = x1 - x2
+    dy = y1 - y2
+    return dx * dx + dy * dy < distance * distance
+
+
+def health_bar_sprite(health, max_health):
+    # Quantized to whole pixels of fill, so there is at most one bar per pixel of width
+    bar_width = scaled(ENEMY_SIZE)
+    health_width = max(0, min(bar_width, int((health / max_health) * bar_width)))
+    sprite = HEALTH_BAR_SPRITES.get(health_width)
+    if sprite is None:
+        bar_height = max(1, scaled(HEALTH_BAR_HEIGHT))
+        sprite = pygame.Surface((bar_width, bar_height)).convert()
+        sprite.fill(RED)
+        sprite.fill(GREEN, (0, 0, health_width, bar_height))
+        HEALTH_BAR_SPRITES[health_width] = sprite
+    return sprite
+
+
+class Timer:
+    def __init__(self, wheel, deadline, order, callback):
+        self.wheel = wheel
+        self.deadline = deadline
+        self.order = order
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        # Left in its slot and skipped when the wheel gets there
+        self.cancelled = True
+
+    @property
+    def remaining(self):
+        return max(0, self.deadline - self.wheel.now)
+
+
+# Hierarchical timer wheel counting frames, timers cascade down levels of 64 slots as they get
+# close and ones due on the same frame fire in the order they were scheduled
+class TimerWheel:
+    SLOT_BITS = 6
+    SLOT_MASK = (1 << SLOT_BITS) - 1
+    LEVELS = 4
+
+    def __init__(self):
+        self.now = 0
+        self.paused = False
+        self.scheduled = 0
+        self.levels = [[[] for _ in range(self.SLOT_MASK + 1)] for _ in range(self.LEVELS)]
+        self.overflow = []  # Timers further away than the top level can hold
+
+    def schedule(self, delay, callback):
+        timer = Timer(self, self.now + max(1, int(delay)), self.scheduled, callback)
+        self.scheduled += 1
+        self.insert(timer)
+        return timer
+
+    def insert(self, timer):
+        for level in range(self.LEVELS):
+            # The lowest level whose current span still contains the deadline
+            shift = self.SLOT_BITS * (level + 1)
+            if timer.deadline >> shift == self.now >> shift:
+                slot = (timer.deadline >> (self.SLOT_BITS * level)) & self.SLOT_MASK
+                self.levels[level][slot].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def tick(self):
+        if self.paused:
+            return
+        self.now += 1
+
+        # Cascade from the top down, so timers moved down a level are seen by the next one
+        wrapped = 0
+        while wrapped < self.LEVELS and self.now & ((1 << (self.SLOT_BITS * (wrapped + 1))) - 1) == 0:
+            wrapped += 1
+        if wrapped == self.LEVELS:
+            timers, self.overflow = self.overflow, []
+            for timer in timers:
+                if not timer.cancelled:
+                    self.insert(timer)
+        for level in range(min(wrapped, self.LEVELS - 1), 0, -1):
+            slot = (self.now >> (self.SLOT_BITS * level)) & self.SLOT_MASK
+            timers, self.levels[level][slot] = self.levels[level][slot], []
+            for timer in timers:
+                if not timer.cancelled:
+                    self.insert(timer)
+
+        slot = self.now & self.SLOT_MASK
+        due, self.levels[0][slot] = self.levels[0][slot], []
+        due.sort(key=lambda timer: timer.order)
+        for timer in due:
+            if not timer.cancelled:
+                timer.callback()
 
 
 class Particle:
-    def __init__(self, x, y, color):
+    def __init__(self, x, y, color, expiry):
         self.x = x
         self.y = y
         self.vx = random.uniform(-3, 3)
         self.vy = random.uniform(-3, 3)
         self.color = color
-        self.lifetime = 30
+        self.expiry = expiry
         self.size = random.randint(3, 8)
 
     def update(self):
         self.x += self.vx
         self.y += self.vy
-        self.lifetime -= 1
         self.size = max(1, self.size - 0.2)
 
     def draw(self, screen):
-        if self.lifetime > 0:
-            alpha = int(255 * (self.lifetime / 30))
-            s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, alpha), (self.size, self.size), self.size)
-            screen.blit(s, (int(self.x - self.size), int(self.y - self.size)))
+        lifetime = self.expiry.remaining
+        if lifetime > 0:
+            alpha = int(255 * (lifetime / PARTICLE_LIFETIME))
+            size = max(1, self.size * RENDER_SCALE)
+            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(s, (*self.color, alpha), (size, size), size)
+            screen.blit(s, (scaled(self.x - self.size), scaled(self.y - self.size)))
 
 
 class Projectile:
@@ -68,8 +245,8 @@ class Projectile:
         if self.x < 0 or self.x > WIDTH or self.y < 0 or self.y > HEIGHT:
             self.active = False
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), PROJECTILE_SIZE)
+    def add_blits(self, batch):
+        batch.append((SPRITES["projectile"], (scaled(self.x - PROJECTILE_SIZE), scaled(self.y - PROJECTILE_SIZE))))
 
 
 class PowerUp:
@@ -77,62 +254,69 @@ class PowerUp:
         self.x = x
         self.y = y
         self.type = type  # "health", "speed", "shield"
-        self.lifetime = 600  # 10 seconds at 60 FPS
+        self.expiry = None
         self.colors = {
             "health": GREEN,
             "speed": CYAN,
             "shield": PURPLE
         }
 
-    def update(self):
-        self.lifetime -= 1
-        return self.lifetime > 0
-
     def draw(self, screen):
         color = self.colors[self.type]
         pulse = abs(math.sin(pygame.time.get_ticks() / 200)) * 50
-        pygame.draw.circle(screen, tuple(min(255, c + pulse) for c in color),
-                           (int(self.x), int(self.y)), POWERUP_SIZE)
-        pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), POWERUP_SIZE, 2)
+        center = (scaled(self.x), scaled(self.y))
+        pygame.draw.circle(screen, tuple(min(255, c + pulse) for c in color), center, scaled(POWERUP_SIZE))
+        pygame.draw.circle(screen, WHITE, center, scaled(POWERUP_SIZE), max(1, scaled(2)))
 
 
 class Player:
-    def __init__(self, x, y, color):
+    def __init__(self, x, y, color, timers, can_dash=True):
         self.x = x
         self.y = y
         self.color = color
+        self.timers = timers
         self.speed = 4
+        self.can_dash = can_dash
         self.max_stamina = 100
         self.stamina = self.max_stamina
         self.dash_cost = 30
         self.dash_speed = 12
         self.is_dashing = False
-        self.dash_cooldown = 0
+        self.dash_ready = True
         self.health = 100
         self.max_health = 100
         self.shield = False
-        self.shield_timer = 0
+        self.shield_timer = None
         self.speed_boost = False
-        self.speed_boost_timer = 0
+        self.speed_boost_timer = None
 
-    def move(self, keys, dt):
-        current_speed = self.speed
+    def give_shield(self, duration):
+        if self.shield_timer is not None:
+            self.shield_timer.cancel()
+        self.shield = True
+        self.shield_timer = self.timers.schedule(duration, self.end_shield)
 
-        # Update buffs
-        if self.shield_timer > 0:
-            self.shield_timer -= 1
-            if self.shield_timer == 0:
-                self.shield = False
+    def end_shield(self):
+        self.shield = False
+        self.shield_timer = None
 
-        if self.speed_boost_timer > 0:
-            self.speed_boost_timer -= 1
-            current_speed = self.speed * 1.5
-            if self.speed_boost_timer == 0:
-                self.speed_boost = False
+    def give_speed_boost(self, duration):
+        if self.speed_boost_timer is not None:
+            self.speed_boost_timer.cancel()
+        self.speed_boost = True
+        self.speed_boost_timer = self.timers.schedule(duration, self.end_speed_boost)
 
-        # Dash cooldown
-        if self.dash_cooldown > 0:
-            self.dash_cooldown -= 1
+    def end_speed_boost(self):
+        self.speed_boost = False
+        self.speed_boost_timer = None
+
+    def end_dash_cooldown(self):
+        self.dash_ready = True
+
+    def move(self, keys, dt):
+        current_speed = self.speed
+        if self.speed_boost:
+            current_speed = self.speed * 1.5
 
         # Stamina regeneration
         if not self.is_dashing and self.stamina < self.max_stamina:
@@ -154,10 +338,11 @@ class Player:
             dy *= 0.707
 
         # Check for dash
-        if keys[pygame.K_SPACE] and self.stamina >= self.dash_cost and self.dash_cooldown == 0 and (dx != 0 or dy != 0):
+        if self.can_dash and keys[pygame.K_SPACE] and self.stamina >= self.dash_cost and self.dash_ready and (dx != 0 or dy != 0):
             self.is_dashing = True
             self.stamina -= self.dash_cost
-            self.dash_cooldown = 20
+            self.dash_ready = False
+            self.timers.schedule(DASH_COOLDOWN, self.end_dash_cooldown)
             speed = self.dash_speed
         elif self.is_dashing:
             speed = self.dash_speed
@@ -185,44 +370,37 @@ class Player:
         # Draw shield effect
         if self.shield:
             pulse = abs(math.sin(pygame.time.get_ticks() / 100)) * 10
-            pygame.draw.circle(screen, PURPLE, (int(self.x), int(self.y)),
-                               PLAYER_SIZE // 2 + 10 + int(pulse), 3)
+            pygame.draw.circle(screen, PURPLE, (scaled(self.x), scaled(self.y)),
+                               scaled(PLAYER_SIZE // 2 + 10 + int(pulse)), max(1, scaled(3)))
 
         # Draw speed boost effect
         if self.speed_boost:
-            trail_color = (*CYAN, 100)
-            s = pygame.Surface((PLAYER_SIZE + 10, PLAYER_SIZE + 10), pygame.SRCALPHA)
-            pygame.draw.rect(s, trail_color, (0, 0, PLAYER_SIZE + 10, PLAYER_SIZE + 10))
-            screen.blit(s, (int(self.x - PLAYER_SIZE // 2 - 5), int(self.y - PLAYER_SIZE // 2 - 5)))
+            screen.blit(SPRITES["speed_trail"],
+                        (scaled(self.x - PLAYER_SIZE // 2 - 5), scaled(self.y - PLAYER_SIZE // 2 - 5)))
 
         # Draw player
-        pygame.draw.rect(screen, self.color,
-                         (int(self.x - PLAYER_SIZE // 2), int(self.y - PLAYER_SIZE // 2),
-                          PLAYER_SIZE, PLAYER_SIZE))
-        pygame.draw.rect(screen, WHITE,
-                         (int(self.x - PLAYER_SIZE // 2), int(self.y - PLAYER_SIZE // 2),
-                          PLAYER_SIZE, PLAYER_SIZE), 2)
+        screen.blit(player_sprite(self.color),
+                    (scaled(self.x - PLAYER_SIZE // 2), scaled(self.y - PLAYER_SIZE // 2)))
 
 
 class Enemy:
-    def __init__(self, x, y, difficulty):
+    def __init__(self, x, y, difficulty, type=None):
         self.x = x
         self.y = y
         self.speed = 1 + (difficulty * 0.1)
         self.health = 2 + difficulty
-        self.max_health = self.health
-        self.type = random.choice(["normal", "fast", "tank"])
+        self.type = type or random.choice(["normal", "fast", "tank"])
 
         if self.type == "fast":
             self.speed *= 1.5
             self.health = max(1, self.health - 1)
-            self.color = ORANGE
         elif self.type == "tank":
             self.speed *= 0.7
             self.health *= 2
-            self.color = (100, 100, 200)
-        else:
-            self.color = BLUE
+        elif self.type == "classic":
+            self.speed = 4 / 3  # A third of the player's speed, like in V1
+        self.max_health = self.health
+        self.color = ENEMY_COLORS[self.type]
 
     def move_towards_player(self, player_x, player_y):
         dx = player_x - self.x
@@ -236,55 +414,105 @@ class Enemy:
         self.health -= amount
         return self.health <= 0
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color,
-                         (int(self.x - ENEMY_SIZE // 2), int(self.y - ENEMY_SIZE // 2),
-                          ENEMY_SIZE, ENEMY_SIZE))
-        # Health bar
-        bar_width = ENEMY_SIZE
-        bar_height = 5
-        health_width = int((self.health / self.max_health) * bar_width)
-        pygame.draw.rect(screen, RED,
-                         (int(self.x - ENEMY_SIZE // 2), int(self.y - ENEMY_SIZE // 2 - 10),
-                          bar_width, bar_height))
-        pygame.draw.rect(screen, GREEN,
-                         (int(self.x - ENEMY_SIZE // 2), int(self.y - ENEMY_SIZE // 2 - 10),
-                          health_width, bar_height))
+    def add_blits(self, batch):
+        left = scaled(self.x - ENEMY_SIZE // 2)
+        top = scaled(self.y - ENEMY_SIZE // 2)
+        batch.append((SPRITES[self.type], (left, top)))
+        # Health bar, only once the enemy has taken a hit
+        if self.health < self.max_health:
+            batch.append((health_bar_sprite(self.health, self.max_health), (left, top - scaled(10))))
 
 
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        with open_asset("art/icons/windows.ico") as icon_file:
+            pygame.display.set_icon(pygame.image.load(icon_file, "windows.ico"))
+
+        # Everything is drawn to an internal render surface which is then presented to the
+        # (resizable) window, so gameplay never depends on the window size
+        self.window = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+        self.screen = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT)).convert()
+        load_sprites()
+        self.resize_window(self.window.get_size())
         pygame.display.set_caption("Enhanced Cube Survival")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = pygame.font.Font(None, max(1, scaled(36)))
+        self.small_font = pygame.font.Font(None, max(1, scaled(24)))
 
         # Game state
-        self.state = "menu"  # menu, playing, paused, game_over, customize
+        self.state = "menu"  # menu, playing, paused, game_over, customize, classic, classic_over
         self.player_color = RED
         self.available_colors = [RED, GREEN, BLUE, YELLOW, PURPLE, ORANGE, CYAN]
         self.color_names = ["Red", "Green", "Blue", "Yellow", "Purple", "Orange", "Cyan"]
         self.selected_color_idx = 0
+        self.screen_cache = {}  # state name -> (inputs, composited surface)
+        self.frame = self.screen  # canvas shown by present(), a cached screen or self.screen
 
         self.reset_game()
 
+        # Music is started by run() once the first frame is up
+        self.music_file = None
+
         # High score
         self.high_score = self.load_high_score()
 
     def reset_game(self):
-        self.player = Player(WIDTH // 2, HEIGHT // 2, self.player_color)
+        self.timers = TimerWheel()
+        self.player = Player(WIDTH // 2, HEIGHT // 2, self.player_color, self.timers)
         self.enemies = []
         self.projectiles = []
         self.powerups = []
         self.particles = []
         self.score = 0
         self.wave = 1
-        self.spawn_timer = 0
         self.spawn_interval = 180  # 3 seconds at 60 FPS
-        self.powerup_timer = 0
         self.difficulty = 0
         self.kills = 0
+        self.timers.schedule(self.spawn_interval, self.spawn_wave)
+        self.timers.schedule(POWERUP_INTERVAL, self.spawn_powerup)
+
+    def reset_classic(self):
+        self.timers = TimerWheel()
+        self.player = Player(WIDTH // 2, HEIGHT // 2, self.player_color, self.timers, can_dash=False)
+        self.enemies = []
+        self.classic_score = 0
+        self.timers.schedule(CLASSIC_SPAWN_INTERVAL, self.spawn_classic_obstacle)
+
+    def start_music(self):
+        # Background music streams from this file object, so it has to stay open
+        self.music_file = open_asset("assets/music/Song.mp3")
+        pygame.mixer.music.load(self.music_file, "mp3")
+        pygame.mixer.music.play(-1)
+
+    def resize_window(self, size):
+        # Fit the canvas inside the window keeping its aspect ratio, the rest is letterbox
+        scale = min(size[0] / WIDTH, size[1] / HEIGHT)
+        view_w = max(1, int(WIDTH * scale))
+        view_h = max(1, int(HEIGHT * scale))
+        self.view_rect = pygame.Rect((size[0] - view_w) // 2, (size[1] - view_h) // 2, view_w, view_h)
+        self.window.fill(BLACK)
+        self.presented = None
+        if self.view_rect.size == (RENDER_WIDTH, RENDER_HEIGHT):
+            self.view_surface = None
+        else:
+            self.view_surface = self.window.subsurface(self.view_rect)
+
+    def window_to_canvas(self, pos):
+        x = (pos[0] - self.view_rect.x) * WIDTH / self.view_rect.width
+        y = (pos[1] - self.view_rect.y) * HEIGHT / self.view_rect.height
+        return x, y
+
+    def present(self):
+        # A cached screen that is already in the window doesn't need copying or scaling again
+        if self.frame is self.presented:
+            return
+        self.presented = None if self.frame is self.screen else self.frame
+        if self.view_surface is None:
+            self.window.blit(self.frame, self.view_rect)
+        elif SMOOTH_SCALING:
+            pygame.transform.smoothscale(self.frame, self.view_rect.size, self.view_surface)
+        else:
+            pygame.transform.scale(self.frame, self.view_rect.size, self.view_surface)
 
     def load_high_score(self):
         if os.path.exists("high_score.txt"):
@@ -309,11 +537,39 @@ class Game:
 
         self.enemies.append(Enemy(x, y, self.difficulty))
 
+    def spawn_wave(self):
+        enemies_to_spawn = 1 + (self.wave // 3)
+        for _ in range(enemies_to_spawn):
+            self.spawn_enemy()
+        self.wave += 1
+        self.difficulty += 1
+        self.timers.schedule(self.spawn_interval, self.spawn_wave)
+
     def spawn_powerup(self):
         x = random.randint(50, WIDTH - 50)
         y = random.randint(50, HEIGHT - 50)
         type = random.choice(["health", "speed", "shield"])
-        self.powerups.append(PowerUp(x, y, type))
+        powerup = PowerUp(x, y, type)
+        powerup.expiry = self.timers.schedule(POWERUP_LIFETIME, lambda: self.powerups.remove(powerup))
+        self.powerups.append(powerup)
+        self.timers.schedule(POWERUP_INTERVAL, self.spawn_powerup)
+
+    def spawn_classic_obstacle(self):
+        # Spawn an obstacle every 5 seconds, each one is worth a point
+        x = random.randint(ENEMY_SIZE // 2, WIDTH - ENEMY_SIZE // 2)
+        y = random.randint(ENEMY_SIZE // 2, HEIGHT - ENEMY_SIZE // 2)
+        self.enemies.append(Enemy(x, y, 0, "classic"))
+        self.classic_score += 1
+        self.timers.schedule(CLASSIC_SPAWN_INTERVAL, self.spawn_classic_obstacle)
+
+    def spawn_particles(self, count, x, y, color):
+        # The whole burst shares one expiry timer, which removes exactly that burst
+        expiry = self.timers.schedule(PARTICLE_LIFETIME, lambda: self.expire_particles(expiry))
+        for _ in range(count):
+            self.particles.append(Particle(x, y, color, expiry))
+
+    def expire_particles(self, expiry):
+        self.particles = [particle for particle in self.particles if particle.expiry is not expiry]
 
     def handle_menu(self, events):
         for event in events:
@@ -323,6 +579,9 @@ class Game:
                     self.reset_game()
                 elif event.key == pygame.K_c:
                     self.state = "customize"
+                elif event.key == pygame.K_v:
+                    self.state = "classic"
+                    self.reset_classic()
 
     def handle_customize(self, events):
         for event in events:
@@ -338,50 +597,35 @@ class Game:
                     self.state = "menu"
 
     def handle_playing(self, events, keys):
+        # Fire buff, cooldown, lifetime and spawn timers due this frame
+        self.timers.tick()
+
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.state = "paused"
+                    self.screen_cache.pop("paused", None)
+                    self.timers.pause()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
-                    self.projectiles.append(self.player.shoot(pygame.mouse.get_pos()))
+                    self.projectiles.append(self.player.shoot(self.window_to_canvas(event.pos)))
 
         dt = self.clock.get_time() / 1000.0
         self.player.move(keys, dt)
 
-        # Spawn enemies
-        self.spawn_timer += 1
-        if self.spawn_timer >= self.spawn_interval:
-            enemies_to_spawn = 1 + (self.wave // 3)
-            for _ in range(enemies_to_spawn):
-                self.spawn_enemy()
-            self.spawn_timer = 0
-            self.wave += 1
-            self.difficulty += 1
-
-        # Spawn powerups
-        self.powerup_timer += 1
-        if self.powerup_timer >= 600:  # Every 10 seconds
-            self.spawn_powerup()
-            self.powerup_timer = 0
-
         # Update enemies
         for enemy in self.enemies[:]:
             enemy.move_towards_player(self.player.x, self.player.y)
 
             # Check collision with player
-            dx = self.player.x - enemy.x
-            dy = self.player.y - enemy.y
-            dist = math.sqrt(dx ** 2 + dy ** 2)
-            if dist < (PLAYER_SIZE + ENEMY_SIZE) / 2:
+            if touching(self.player.x, self.player.y, enemy.x, enemy.y, (PLAYER_SIZE + ENEMY_SIZE) / 2):
                 if self.player.take_damage(10):
                     self.state = "game_over"
                     if self.score > self.high_score:
                         self.high_score = self.score
                         self.save_high_score()
                 self.enemies.remove(enemy)
-                for _ in range(20):
-                    self.particles.append(Particle(enemy.x, enemy.y, enemy.color))
+                self.spawn_particles(20, enemy.x, enemy.y, enemy.color)
 
         # Update projectiles
         for proj in self.projectiles[:]:
@@ -392,56 +636,68 @@ class Game:
 
             # Check collision with enemies
             for enemy in self.enemies[:]:
-                dx = proj.x - enemy.x
-                dy = proj.y - enemy.y
-                dist = math.sqrt(dx ** 2 + dy ** 2)
-                if dist < (PROJECTILE_SIZE + ENEMY_SIZE / 2):
+                if touching(proj.x, proj.y, enemy.x, enemy.y, PROJECTILE_SIZE + ENEMY_SIZE / 2):
                     if enemy.take_damage(1):
                         self.enemies.remove(enemy)
                         self.score += 10
                         self.kills += 1
-                        for _ in range(15):
-                            self.particles.append(Particle(enemy.x, enemy.y, enemy.color))
+                        self.spawn_particles(15, enemy.x, enemy.y, enemy.color)
                     self.projectiles.remove(proj)
                     break
 
         # Update powerups
         for powerup in self.powerups[:]:
-            if not powerup.update():
-                self.powerups.remove(powerup)
-                continue
-
             # Check collision with player
-            dx = self.player.x - powerup.x
-            dy = self.player.y - powerup.y
-            dist = math.sqrt(dx ** 2 + dy ** 2)
-            if dist < (PLAYER_SIZE + POWERUP_SIZE) / 2:
+            if touching(self.player.x, self.player.y, powerup.x, powerup.y, (PLAYER_SIZE + POWERUP_SIZE) / 2):
                 if powerup.type == "health":
                     self.player.health = min(self.player.max_health, self.player.health + 30)
                 elif powerup.type == "speed":
-                    self.player.speed_boost = True
-                    self.player.speed_boost_timer = 300
+                    self.player.give_speed_boost(BUFF_DURATION)
                 elif powerup.type == "shield":
-                    self.player.shield = True
-                    self.player.shield_timer = 300
+                    self.player.give_shield(BUFF_DURATION)
+                powerup.expiry.cancel()
                 self.powerups.remove(powerup)
-                for _ in range(10):
-                    self.particles.append(Particle(powerup.x, powerup.y, powerup.colors[powerup.type]))
+                self.spawn_particles(10, powerup.x, powerup.y, powerup.colors[powerup.type])
 
-        # Update particles
-        for particle in self.particles[:]:
+        # Update particles, expired ones are removed by their timer
+        for particle in self.particles:
             particle.update()
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
 
         # Increase score over time
         self.score += 0.1
 
+    def handle_classic(self, events, keys):
+        self.timers.tick()
+
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.state = "menu"
+
+        self.player.move(keys, self.clock.get_time() / 1000.0)
+
+        for enemy in self.enemies:
+            enemy.move_towards_player(self.player.x, self.player.y)
+            if touching(self.player.x, self.player.y, enemy.x, enemy.y, (PLAYER_SIZE + ENEMY_SIZE) / 2):
+                self.state = "classic_over"
+                self.screen_cache.pop("classic_over", None)
+                break
+
+    def handle_classic_over(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self.state = "classic"
+                    self.reset_classic()
+                elif event.key == pygame.K_ESCAPE:
+                    self.state = "menu"
+
     def handle_paused(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.state = "playing"
+                    self.timers.resume()
                 elif event.key == pygame.K_q:
                     self.state = "menu"
 
@@ -454,15 +710,16 @@ class Game:
                 elif event.key == pygame.K_ESCAPE:
                     self.state = "menu"
 
-    def draw_menu(self):
-        self.screen.fill(BLACK)
+    def compose_menu(self, surface):
+        surface.fill(BLACK)
 
         title = self.font.render("ENHANCED CUBE SURVIVAL", True, YELLOW)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 150))
+        surface.blit(title, (RENDER_WIDTH // 2 - title.get_width() // 2, scaled(150)))
 
         instructions = [
             "Press ENTER to Start",
             "Press C to Customize",
+            "Press V for Classic Mode",
             "",
             "Controls:",
             "WASD - Move",
@@ -474,34 +731,35 @@ class Game:
         y = 250
         for line in instructions:
             text = self.small_font.render(line, True, WHITE)
-            self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
+            surface.blit(text, (RENDER_WIDTH // 2 - text.get_width() // 2, scaled(y)))
             y += 35
 
         high_score_text = self.font.render(f"High Score: {int(self.high_score)}", True, GREEN)
-        self.screen.blit(high_score_text, (WIDTH // 2 - high_score_text.get_width() // 2, HEIGHT - 80))
+        surface.blit(high_score_text, (RENDER_WIDTH // 2 - high_score_text.get_width() // 2, scaled(HEIGHT - 80)))
 
-    def draw_customize(self):
-        self.screen.fill(BLACK)
+    def compose_customize(self, surface):
+        surface.fill(BLACK)
 
         title = self.font.render("CUSTOMIZE YOUR CUBE", True, YELLOW)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 150))
+        surface.blit(title, (RENDER_WIDTH // 2 - title.get_width() // 2, scaled(150)))
 
         # Draw color options
         y = 300
         for i, (color, name) in enumerate(zip(self.available_colors, self.color_names)):
             x = WIDTH // 2 - 100
             if i == self.selected_color_idx:
-                pygame.draw.rect(self.screen, WHITE, (x - 10, y - 10, 220, 70), 3)
+                pygame.draw.rect(surface, WHITE, scaled_rect(x - 10, y - 10, 220, 70), max(1, scaled(3)))
 
-            pygame.draw.rect(self.screen, color, (x, y, 50, 50))
+            pygame.draw.rect(surface, color, scaled_rect(x, y, 50, 50))
             text = self.small_font.render(name, True, WHITE)
-            self.screen.blit(text, (x + 70, y + 15))
+            surface.blit(text, (scaled(x + 70), scaled(y + 15)))
             y += 80
 
         instructions = self.small_font.render("Use LEFT/RIGHT arrows, ENTER to confirm, ESC to go back", True, GRAY)
-        self.screen.blit(instructions, (WIDTH // 2 - instructions.get_width() // 2, HEIGHT - 100))
+        surface.blit(instructions, (RENDER_WIDTH // 2 - instructions.get_width() // 2, scaled(HEIGHT - 100)))
 
     def draw_playing(self, fps):
+        self.frame = self.screen
         self.screen.fill(BLACK)
 
         # Draw particles
@@ -512,13 +770,13 @@ class Game:
         for powerup in self.powerups:
             powerup.draw(self.screen)
 
-        # Draw enemies
+        # Draw enemies and projectiles in a single batched blit
+        batch = []
         for enemy in self.enemies:
-            enemy.draw(self.screen)
-
-        # Draw projectiles
+            enemy.add_blits(batch)
         for proj in self.projectiles:
-            proj.draw(self.screen)
+            proj.add_blits(batch)
+        self.screen.blits(batch, False)
 
         # Draw player
         self.player.draw(self.screen)
@@ -526,102 +784,154 @@ class Game:
         # Draw UI
         # FPS Counter
         fps_text = self.small_font.render(f"FPS: {int(fps)}", True, WHITE)
-        self.screen.blit(fps_text, (WIDTH - 100, 10))
+        self.screen.blit(fps_text, (scaled(WIDTH - 100), scaled(10)))
 
         # Score
         score_text = self.font.render(f"Score: {int(self.score)}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
+        self.screen.blit(score_text, (scaled(10), scaled(10)))
 
         # Wave
         wave_text = self.small_font.render(f"Wave: {self.wave}", True, CYAN)
-        self.screen.blit(wave_text, (10, 50))
+        self.screen.blit(wave_text, (scaled(10), scaled(50)))
 
         # Kills
         kills_text = self.small_font.render(f"Kills: {self.kills}", True, RED)
-        self.screen.blit(kills_text, (10, 80))
+        self.screen.blit(kills_text, (scaled(10), scaled(80)))
 
         # Health bar
         bar_width = 200
         bar_height = 20
         health_width = int((self.player.health / self.player.max_health) * bar_width)
-        pygame.draw.rect(self.screen, GRAY, (10, HEIGHT - 70, bar_width, bar_height))
-        pygame.draw.rect(self.screen, RED, (10, HEIGHT - 70, health_width, bar_height))
-        pygame.draw.rect(self.screen, WHITE, (10, HEIGHT - 70, bar_width, bar_height), 2)
+        pygame.draw.rect(self.screen, GRAY, scaled_rect(10, HEIGHT - 70, bar_width, bar_height))
+        pygame.draw.rect(self.screen, RED, scaled_rect(10, HEIGHT - 70, health_width, bar_height))
+        pygame.draw.rect(self.screen, WHITE, scaled_rect(10, HEIGHT - 70, bar_width, bar_height), max(1, scaled(2)))
         health_text = self.small_font.render(f"Health: {int(self.player.health)}", True, WHITE)
-        self.screen.blit(health_text, (10, HEIGHT - 95))
+        self.screen.blit(health_text, (scaled(10), scaled(HEIGHT - 95)))
 
         # Stamina bar
         stamina_width = int((self.player.stamina / self.player.max_stamina) * bar_width)
-        pygame.draw.rect(self.screen, GRAY, (10, HEIGHT - 40, bar_width, bar_height))
-        pygame.draw.rect(self.screen, GREEN, (10, HEIGHT - 40, stamina_width, bar_height))
-        pygame.draw.rect(self.screen, WHITE, (10, HEIGHT - 40, bar_width, bar_height), 2)
+        pygame.draw.rect(self.screen, GRAY, scaled_rect(10, HEIGHT - 40, bar_width, bar_height))
+        pygame.draw.rect(self.screen, GREEN, scaled_rect(10, HEIGHT - 40, stamina_width, bar_height))
+        pygame.draw.rect(self.screen, WHITE, scaled_rect(10, HEIGHT - 40, bar_width, bar_height), max(1, scaled(2)))
         stamina_text = self.small_font.render(f"Stamina", True, WHITE)
-        self.screen.blit(stamina_text, (10, HEIGHT - 20))
+        self.screen.blit(stamina_text, (scaled(10), scaled(HEIGHT - 20)))
 
         # Active buffs
         buff_y = HEIGHT - 70
         if self.player.shield:
             shield_text = self.small_font.render("SHIELD ACTIVE", True, PURPLE)
-            self.screen.blit(shield_text, (WIDTH - 200, buff_y))
+            self.screen.blit(shield_text, (scaled(WIDTH - 200), scaled(buff_y)))
             buff_y -= 30
         if self.player.speed_boost:
             speed_text = self.small_font.render("SPEED BOOST", True, CYAN)
-            self.screen.blit(speed_text, (WIDTH - 200, buff_y))
-
-    def draw_paused(self):
-        # Draw game in background
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
-        for proj in self.projectiles:
-            proj.draw(self.screen)
-        self.player.draw(self.screen)
+            self.screen.blit(speed_text, (scaled(WIDTH - 200), scaled(buff_y)))
 
-        # Draw pause overlay
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    def compose_paused(self, surface):
+        # The last gameplay frame is still on the canvas, freeze it under the overlay
+        surface.blit(self.screen, (0, 0))
+        overlay = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        surface.blit(overlay, (0, 0))
 
         title = self.font.render("PAUSED", True, YELLOW)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 2 - 100))
+        surface.blit(title, (RENDER_WIDTH // 2 - title.get_width() // 2, scaled(HEIGHT // 2 - 100)))
 
         resume = self.small_font.render("Press ESC to Resume", True, WHITE)
-        self.screen.blit(resume, (WIDTH // 2 - resume.get_width() // 2, HEIGHT // 2))
+        surface.blit(resume, (RENDER_WIDTH // 2 - resume.get_width() // 2, scaled(HEIGHT // 2)))
 
         quit_text = self.small_font.render("Press Q to Quit to Menu", True, WHITE)
-        self.screen.blit(quit_text, (WIDTH // 2 - quit_text.get_width() // 2, HEIGHT // 2 + 40))
+        surface.blit(quit_text, (RENDER_WIDTH // 2 - quit_text.get_width() // 2, scaled(HEIGHT // 2 + 40)))
 
-    def draw_game_over(self):
-        self.screen.fill(BLACK)
+    def compose_game_over(self, surface):
+        surface.fill(BLACK)
 
         title = self.font.render("GAME OVER", True, RED)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 200))
+        surface.blit(title, (RENDER_WIDTH // 2 - title.get_width() // 2, scaled(200)))
 
         score_text = self.font.render(f"Final Score: {int(self.score)}", True, WHITE)
-        self.screen.blit(score_text, (WIDTH // 2 - score_text.get_width() // 2, 280))
+        surface.blit(score_text, (RENDER_WIDTH // 2 - score_text.get_width() // 2, scaled(280)))
 
         kills_text = self.font.render(f"Enemies Killed: {self.kills}", True, WHITE)
-        self.screen.blit(kills_text, (WIDTH // 2 - kills_text.get_width() // 2, 330))
+        surface.blit(kills_text, (RENDER_WIDTH // 2 - kills_text.get_width() // 2, scaled(330)))
 
         wave_text = self.font.render(f"Waves Survived: {self.wave - 1}", True, WHITE)
-        self.screen.blit(wave_text, (WIDTH // 2 - wave_text.get_width() // 2, 380))
+        surface.blit(wave_text, (RENDER_WIDTH // 2 - wave_text.get_width() // 2, scaled(380)))
 
         if self.score >= self.high_score:
             new_high = self.font.render("NEW HIGH SCORE!", True, YELLOW)
-            self.screen.blit(new_high, (WIDTH // 2 - new_high.get_width() // 2, 430))
+            surface.blit(new_high, (RENDER_WIDTH // 2 - new_high.get_width() // 2, scaled(430)))
 
         restart = self.small_font.render("Press SPACE to Restart", True, GREEN)
-        self.screen.blit(restart, (WIDTH // 2 - restart.get_width() // 2, HEIGHT - 150))
+        surface.blit(restart, (RENDER_WIDTH // 2 - restart.get_width() // 2, scaled(HEIGHT - 150)))
 
         menu_text = self.small_font.render("Press ESC for Menu", True, WHITE)
-        self.screen.blit(menu_text, (WIDTH // 2 - menu_text.get_width() // 2, HEIGHT - 100))
+        surface.blit(menu_text, (RENDER_WIDTH // 2 - menu_text.get_width() // 2, scaled(HEIGHT - 100)))
+
+    def draw_cached(self, name, key, compose):
+        # Static screens are composited once and only rebuilt when their inputs change
+        cached = self.screen_cache.get(name)
+        if cached is None or cached[0] != key:
+            surface = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT)).convert()
+            compose(surface)
+            cached = (key, surface)
+            self.screen_cache[name] = cached
+        self.frame = cached[1]
+
+    def draw_menu(self):
+        self.draw_cached("menu", int(self.high_score), self.compose_menu)
+
+    def draw_customize(self):
+        self.draw_cached("customize", self.selected_color_idx, self.compose_customize)
+
+    def draw_classic(self):
+        self.frame = self.screen
+        self.screen.fill(BLACK)
+
+        batch = []
+        for enemy in self.enemies:
+            enemy.add_blits(batch)
+        self.screen.blits(batch, False)
+        self.player.draw(self.screen)
+
+        score_text = self.font.render(f"Score: {self.classic_score}", True, WHITE)
+        self.screen.blit(score_text, (scaled(10), scaled(10)))
+
+    def compose_classic_over(self, surface):
+        # Freeze the frame the player died on under the message
+        surface.blit(self.screen, (0, 0))
+
+        text = self.font.render("You died! Press SPACE to respawn", True, RED)
+        surface.blit(text, (RENDER_WIDTH // 2 - text.get_width() // 2, scaled(HEIGHT // 2)))
+
+        menu_text = self.small_font.render("Press ESC for Menu", True, WHITE)
+        surface.blit(menu_text, (RENDER_WIDTH // 2 - menu_text.get_width() // 2, scaled(HEIGHT // 2 + 50)))
+
+    def draw_classic_over(self):
+        self.draw_cached("classic_over", None, self.compose_classic_over)
+
+    def draw_paused(self):
+        self.draw_cached("paused", None, self.compose_paused)
+
+    def draw_game_over(self):
+        key = (int(self.score), self.kills, self.wave, int(self.high_score))
+        self.draw_cached("game_over", key, self.compose_game_over)
 
     def run(self):
+        # Show the first frame before loading the music
+        self.draw_menu()
+        self.present()
+        pygame.display.flip()
+        self.start_music()
+
         running = True
         while running:
             events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEORESIZE:
+                    self.window = pygame.display.get_surface()
+                    self.resize_window(self.window.get_size())
 
             keys = pygame.key.get_pressed()
 
@@ -640,7 +950,14 @@ class Game:
             elif self.state == "game_over":
                 self.handle_game_over(events)
                 self.draw_game_over()
-
+            elif self.state == "classic":
+                self.handle_classic(events, keys)
+                self.draw_classic()
+            elif self.state == "classic_over":
+                self.handle_classic_over(events)
+                self.draw_classic_over()
+
+            self.present()
             pygame.display.flip()
             self.clock.tick(FPS)
 